@@ -2,7 +2,9 @@
 # アプリ名: 0. Dayスケジュール
 import sys
 import os
-import traceback
+import bisect
+import mmap
+from collections import namedtuple
 from contextlib import contextmanager
 from functools import wraps
 import sqlite3
@@ -12,11 +14,16 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTimeEdit, QListWidget, QDialog,
     QLineEdit, QListWidgetItem, QComboBox, QInputDialog, QMessageBox,
-    QTableWidget, QTableWidgetItem, QToolTip, QCheckBox, QProgressBar,
-    QListView
+    QTableView, QToolTip, QCheckBox, QProgressBar,
+    QListView, QAbstractItemView
+)
+from PySide6.QtCore import (
+    Qt, QTime, QRect, QTimer, QDateTime, QEvent, QAbstractTableModel,
+    QObject, QRunnable, QThreadPool, QRecursiveMutex, Signal
+)
+from PySide6.QtGui import (
+    QPainter, QColor, QBrush, QPen, QFont, QFontMetrics, QTransform, QPixmap, QStaticText
 )
-from PySide6.QtCore import Qt, QTime, QRect, QTimer, QDateTime
-from PySide6.QtGui import QPainter, QColor, QBrush, QPen, QFont, QTransform, QPixmap
 import winsound
 
 # 定数定義
@@ -39,16 +46,58 @@ HOSTNAME = socket.gethostname()
 
 # SQLite関連の定数を追加
 DB_NAME = "schedule.db"
+# 接続時に適用するPRAGMA（プロセス終了まで維持）
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-64000;",
+    "PRAGMA mmap_size=268435456;",
+)
+# スキーマのバージョン（PRAGMA user_version に記録）
+SCHEMA_VERSION = 2
 
 
 # 例外処理関数の定義
 def get_except_processing():
     """
-    例外のトレースバックを取得し、メッセージボックスで表示する
+    例外のトレースバックを文字列で取得する
     """
-    t, v, tb = sys.exc_info()
-    trace = traceback.format_exception(t, v, tb)
-    return trace
+    import traceback  # エラー時にしか使わないため遅延インポート
+    return traceback.format_exc()
+
+
+# ホスト名 -> "x,y"（起動時に一度だけ読み込み、以降は保存のたびに更新）
+_POSITIONS = None
+
+
+def _read_positions():
+    """位置ファイルを読み込み、ホスト名をキーにした辞書を返す"""
+    positions = {}
+    if os.path.exists(POSITION_FILE) and os.path.getsize(POSITION_FILE) > 0:
+        # csvモジュールを通さず、mmapしたバイト列を直接分割して読む
+        fd = os.open(POSITION_FILE, os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            try:
+                data = mm[3:] if mm[:3] == b'\xef\xbb\xbf' else mm[:]
+            finally:
+                mm.close()
+        finally:
+            os.close(fd)
+        for line in data.splitlines():
+            host, sep, value = line.partition(b',')
+            if sep:
+                positions[host.decode('utf-8')] = value.strip(b'"').decode('ascii')
+    return positions
+
+
+def _load_positions():
+    """読み込み済みの位置情報を返す（未読込ならファイルから読む）"""
+    global _POSITIONS
+    if _POSITIONS is None:
+        _POSITIONS = _read_positions()
+    return _POSITIONS
 
 
 def restore_position(root):
@@ -56,16 +105,12 @@ def restore_position(root):
     CSVファイルからウィンドウの位置を復元する。
     """
     try:
-        if os.path.exists(POSITION_FILE):
-            with open(POSITION_FILE, 'r', newline='', encoding='utf_8_sig') as csvfile:
-                reader = csv.reader(csvfile)
-                for row in reader:
-                    if row and row[0] == HOSTNAME:
-                        coords = row[1].split(',')
-                        if len(coords) == 2:
-                            x, y = map(int, coords)
-                            root.move(x, y)
-                        break
+        position = _load_positions().get(HOSTNAME)
+        if position:
+            coords = position.split(',')
+            if len(coords) == 2:
+                x, y = map(int, coords)
+                root.move(x, y)
     except Exception as e:
         print(f"ウィンドウ位置の復元中にエラーが発生: {str(e)}")
 
@@ -75,39 +120,92 @@ def save_position(window):
     ウィンドウの位置をCSVファイルに保存する。
     """
     try:
-        # 既存のデータを読み込む
-        existing_data = []
-        if os.path.exists(POSITION_FILE):
-            with open(POSITION_FILE, 'r', newline='', encoding='utf_8_sig') as csvfile:
-                reader = csv.reader(csvfile)
-                existing_data = [row for row in reader if row and row[0] != HOSTNAME]
-
-        # 現在の位置を追加
+        global _POSITIONS
         pos = window.pos()
-        current_position = f"{pos.x()},{pos.y()}"
-        existing_data.append([HOSTNAME, current_position])
+        position = f"{pos.x()},{pos.y()}"
+        # 自ホストの位置が変わっていなければ書き込まない
+        if _load_positions().get(HOSTNAME) == position:
+            return
+        # 位置ファイルは他のPCと共有されるため、書き込む直前に読み直して他ホストの行を保つ
+        positions = _read_positions()
+        positions[HOSTNAME] = position
+        _POSITIONS = positions
 
         # データを保存
-        with open(POSITION_FILE, 'w', newline='', encoding='utf_8_sig') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerows(existing_data)
+        if len(positions) == 1:
+            # 1ホストのみなら csv を通さず1行で書き出す（BOMも付けない）
+            with open(POSITION_FILE, 'w', newline='', encoding='utf-8') as f:
+                f.write(f"{HOSTNAME},{positions[HOSTNAME]}\n")
+        else:
+            with open(POSITION_FILE, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerows(positions.items())
     except Exception as e:
         print(f"ウィンドウ位置の保存中にエラーが発生: {str(e)}")
 
 
+# アプリ全体で共有するSQLite接続（init_db で生成し、終了時に close_db_connection で閉じる）
+_CONN = None
+# ワーカースレッドからも使うため、接続の利用は1スレッドずつに制限する（トランザクション中の入れ子取得あり）
+_DB_MUTEX = QRecursiveMutex()
+
+
+def _open_db_connection():
+    """共有接続を取得する（未接続なら生成）"""
+    global _CONN
+    if _CONN is None:
+        # 自動コミット接続。複数文をまとめる時は db_transaction を使い、各操作では commit しない
+        # （外側のトランザクションの途中で確定させてしまうため）
+        _CONN = sqlite3.connect(DB_NAME, check_same_thread=False, isolation_level=None)
+        # コミット毎のfsyncを避けるためWAL + synchronous=NORMAL、キャッシュも拡張
+        for pragma in DB_PRAGMAS:
+            _CONN.execute(pragma)
+    return _CONN
+
+
+def close_db_connection():
+    """共有接続を閉じる（アプリ終了時に1回だけ呼ぶ）"""
+    global _CONN
+    _DB_MUTEX.lock()
+    try:
+        if _CONN is not None:
+            _CONN.close()
+            _CONN = None
+    finally:
+        _DB_MUTEX.unlock()
+
+
 @contextmanager
 def get_db_connection():
-    """SQLiteデータベース接続のコンテキストマネージャ"""
-    conn = None
+    """SQLiteデータベース接続のコンテキストマネージャ（共有接続を返し、閉じない）"""
+    _DB_MUTEX.lock()
     try:
-        conn = sqlite3.connect(DB_NAME)
-        yield conn
+        yield _open_db_connection()
     except sqlite3.Error as e:
         print(f"データベース接続エラー: {e}")
         raise
     finally:
-        if conn:
-            conn.close()
+        _DB_MUTEX.unlock()
+
+
+@contextmanager
+def db_transaction():
+    """共有接続上で1つのトランザクションを張る（例外時はロールバック）
+
+    既に外側のトランザクション内であれば、それにそのまま参加する。
+    """
+    with get_db_connection() as conn:
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
 
 
 def db_operation(func):
@@ -121,14 +219,27 @@ def db_operation(func):
 
 def init_db():
     """データベースの初期化とマイグレーション"""
+    conn = _open_db_connection()
+    c = conn.cursor()
     try:
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
+        # スキーマが最新なら何もしない
+        c.execute('PRAGMA user_version')
+        if c.fetchone()[0] >= SCHEMA_VERSION:
+            return
+        
+        c.execute('BEGIN')
         
         # 既存のテーブルの存在確認
         c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schedules'")
         schedules_exists = c.fetchone() is not None
         
+        # profile_idカラムの無い旧スキーマの場合のみ移行が必要
+        needs_profile_migration = False
+        if schedules_exists:
+            c.execute('PRAGMA table_info(schedules)')
+            columns = [row[1] for row in c.fetchall()]
+            needs_profile_migration = 'profile_id' not in columns
+        
         # プロファイルテーブルの作成
         c.execute('''
             CREATE TABLE IF NOT EXISTS profiles
@@ -136,17 +247,13 @@ def init_db():
              name TEXT UNIQUE)
         ''')
         
-        if schedules_exists:
-            # 既存のschedulesテーブルが存在する場合、一時テーブルにデータを退避
-            # profile_idカラムも含めて退避するように変更
-            c.execute('''CREATE TABLE schedules_backup AS 
-                     SELECT id, COALESCE(profile_id, 1) as profile_id, name, start_time, end_time, color 
-                     FROM schedules''')
-            c.execute('DROP TABLE schedules')
+        if needs_profile_migration:
+            # 旧schedulesテーブルにはカラム追加のみ行う（行のコピーは不要、既存行はデフォルトプロファイル）
+            c.execute('ALTER TABLE schedules ADD COLUMN profile_id INTEGER DEFAULT 1 REFERENCES profiles(id)')
         
         # 新しいschedulesテーブルの作成
         c.execute('''
-            CREATE TABLE schedules
+            CREATE TABLE IF NOT EXISTS schedules
             (id INTEGER PRIMARY KEY AUTOINCREMENT,
              profile_id INTEGER DEFAULT 1,
              name TEXT,
@@ -156,13 +263,8 @@ def init_db():
              FOREIGN KEY(profile_id) REFERENCES profiles(id))
         ''')
         
-        if schedules_exists:
-            # バックアップからデータを復元（profile_idを保持）
-            c.execute('''
-                INSERT INTO schedules (id, profile_id, name, start_time, end_time, color)
-                SELECT id, profile_id, name, start_time, end_time, color FROM schedules_backup
-            ''')
-            c.execute('DROP TABLE schedules_backup')
+        # プロファイル別の読み込みを範囲検索にするためのインデックス
+        c.execute('CREATE INDEX IF NOT EXISTS idx_sched_profile_start ON schedules(profile_id, start_time)')
         
         # デフォルトプロファイルの作成
         c.execute('INSERT OR IGNORE INTO profiles (id, name) VALUES (1, "デフォルト")')
@@ -187,19 +289,13 @@ def init_db():
             )
         ''')
         
+        c.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
         conn.commit()
     except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.rollback()
         print(f"データベース初期化エラー: {e}")
         raise
-    finally:
-        conn.close()
-
-
-def get_exception_trace():
-    """例外のトレースバックを取得"""
-    t, v, tb = sys.exc_info()
-    trace = traceback.format_exception(t, v, tb)
-    return trace
 
 
 def debug_profile_operation(operation_name):
@@ -230,9 +326,35 @@ def debug_profile_operation(operation_name):
     return decorator
 
 
+def hhmm_to_minutes(hhmm):
+    """"HH:mm" 形式の文字列を0時からの分に変換（QTime.fromString を経由しない）"""
+    hour, minute = hhmm.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+# 色コード -> QColor のメモ（返した QColor は共有されるため呼び出し側で変更しないこと）
+_QCOLOR_CACHE = {}
+_COMPLEMENT_CACHE = {}
+
+
+def get_qcolor(hex_color):
+    """色コードに対応する QColor をキャッシュから返す"""
+    color = _QCOLOR_CACHE.get(hex_color)
+    if color is None:
+        color = _QCOLOR_CACHE.setdefault(hex_color, QColor(hex_color))
+    return color
+
+
 def get_complementary_color(hex_color):
-    """補色を計算する関数"""
-    color = QColor(hex_color)
+    """補色を計算する関数（色コードごとにキャッシュ）"""
+    text_color = _COMPLEMENT_CACHE.get(hex_color)
+    if text_color is None:
+        text_color = _COMPLEMENT_CACHE.setdefault(hex_color, _compute_complementary_color(hex_color))
+    return text_color
+
+
+def _compute_complementary_color(hex_color):
+    color = get_qcolor(hex_color)
     r, g, b = color.red(), color.green(), color.blue()
     
     # 輝度を計算して文字色を調整
@@ -262,8 +384,34 @@ def is_dark_mode_enabled():
         return False
 
 
+# スケジュール保存用SQL（同じ文字列を使い回してsqlite3の文キャッシュに乗せる）
+SCHEDULE_INSERT_SQL = '''
+    INSERT INTO schedules (profile_id, name, start_time, end_time, color)
+    VALUES (?, ?, ?, ?, ?)
+'''
+SCHEDULE_UPDATE_SQL = '''
+    UPDATE schedules
+    SET profile_id=?, name=?, start_time=?, end_time=?, color=?
+    WHERE id=?
+'''
+SCHEDULE_SELECT_BY_PROFILE_SQL = '''
+    SELECT id, name, start_time, end_time, color
+    FROM schedules
+    WHERE profile_id=?
+    ORDER BY id
+'''
+LAST_PROFILE_UPDATE_SQL = 'UPDATE last_profile SET profile_id = ? WHERE id = 1'
+
+
 class Schedule:
     """スケジュール項目を管理するクラス"""
+    # 行数分生成されるため __dict__ を持たせず固定スロットで保持する
+    __slots__ = (
+        'id', 'profile_id', 'name', 'start_time', 'end_time', 'color',
+        '_start_minutes', '_end_minutes', '_duration_minutes', '_qcolor', '_text_color',
+        '_time_label', '_label_long', '_label_short',
+    )
+
     def __init__(self, name, start_time, end_time, color, id=None, profile_id=1):
         self.id = id
         self.profile_id = profile_id
@@ -271,48 +419,62 @@ class Schedule:
         self.start_time = start_time
         self.end_time = end_time
         self.color = color
-
-    def save_schedule_to_db(self):
-        """スケジュールをデータベースに保存"""
-        conn = sqlite3.connect(DB_NAME)
+        self.update_cache()
+
+    def update_cache(self):
+        """描画で使う分単位の時刻・色・ラベル文字列を事前計算する（内容を変更したら呼ぶ）"""
+        self._start_minutes = hhmm_to_minutes(self.start_time)
+        self._end_minutes = hhmm_to_minutes(self.end_time)
+        if self._end_minutes > self._start_minutes:
+            self._duration_minutes = self._end_minutes - self._start_minutes
+        else:
+            self._duration_minutes = 24 * 60 - self._start_minutes + self._end_minutes
+        self._qcolor = get_qcolor(self.color)
+        self._text_color = get_complementary_color(self.color)
+        # バー幅に応じて使い分けるラベル
+        self._time_label = f"{self.start_time}-{self.end_time}"
+        self._label_long = f"{self.name}\n{self._time_label}"
+        self._label_short = f"{self.name}\n{self.start_time}"
+
+    def save_to_db(self, conn=None):
+        """スケジュールをデータベースに保存
+
+        conn を渡した場合は呼び出し側のトランザクション内で実行する（コミットしない）。
+        """
+        if conn is None:
+            with db_transaction() as conn:
+                return self.save_to_db(conn)
         c = conn.cursor()
         if self.id is None:
-            c.execute('''
-                INSERT INTO schedules (profile_id, name, start_time, end_time, color)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (self.profile_id, self.name, self.start_time, self.end_time, self.color))
+            c.execute(SCHEDULE_INSERT_SQL,
+                      (self.profile_id, self.name, self.start_time, self.end_time, self.color))
             self.id = c.lastrowid
         else:
-            c.execute('''
-                UPDATE schedules
-                SET profile_id=?, name=?, start_time=?, end_time=?, color=?
-                WHERE id=?
-            ''', (self.profile_id, self.name, self.start_time, self.end_time, self.color, self.id))
-        
-        conn.commit()
-        conn.close()
+            c.execute(SCHEDULE_UPDATE_SQL,
+                      (self.profile_id, self.name, self.start_time, self.end_time, self.color, self.id))
+
+    @staticmethod
+    def save_many(schedules):
+        """複数のスケジュールを1トランザクションでまとめて保存（コミット時のfsyncを1回にする）"""
+        with db_transaction() as conn:
+            for schedule in schedules:
+                schedule.save_to_db(conn)
 
     @staticmethod
-    def load_all_from_db(profile_id=1):
+    @db_operation
+    def load_all_from_db(conn, profile_id=1):
         """指定されたプロファイルのスケジュールをデータベースから読み込む"""
-        conn = sqlite3.connect(DB_NAME)
         c = conn.cursor()
-        c.execute('SELECT id, name, start_time, end_time, color FROM schedules WHERE profile_id=?', (profile_id,))
-        schedules = []
-        for row in c.fetchall():
-            schedule = Schedule(row[1], row[2], row[3], row[4], row[0], profile_id)
-            schedules.append(schedule)
-        conn.close()
-        return schedules
+        c.execute(SCHEDULE_SELECT_BY_PROFILE_SQL, (profile_id,))
+        S = Schedule  # 行ごとのグローバル参照を避ける
+        return [S(r[1], r[2], r[3], r[4], r[0], profile_id) for r in c.fetchall()]
 
     @staticmethod
-    def delete_from_db(id):
+    @db_operation
+    def delete_from_db(conn, id):
         """指定されたIDのスケジュールを削除"""
-        conn = sqlite3.connect(DB_NAME)
         c = conn.cursor()
         c.execute('DELETE FROM schedules WHERE id=?', (id,))
-        conn.commit()
-        conn.close()
 
     @staticmethod
     @db_operation
@@ -320,15 +482,10 @@ class Schedule:
         """すべてのスケジュールを削除"""
         c = conn.cursor()
         c.execute('DELETE FROM schedules')
-        conn.commit()
 
     def get_minutes(self):
         """開始時刻と終了時刻を分単位で返す"""
-        start = QTime.fromString(self.start_time, "HH:mm")
-        end = QTime.fromString(self.end_time, "HH:mm")
-        start_minutes = start.hour() * 60 + start.minute()
-        end_minutes = end.hour() * 60 + end.minute()
-        return start_minutes, end_minutes
+        return self._start_minutes, self._end_minutes
 
 
 class FreeAlarm:
@@ -340,44 +497,36 @@ class FreeAlarm:
         self.enabled = bool(enabled)
 
     def save_to_db(self):
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        if self.id is None:
-            c.execute(
-                'INSERT INTO free_alarms (time_text, label, enabled) VALUES (?, ?, ?)',
-                (self.time_text, self.label, 1 if self.enabled else 0)
-            )
-            self.id = c.lastrowid
-        else:
-            c.execute(
-                'UPDATE free_alarms SET time_text=?, label=?, enabled=? WHERE id=?',
-                (self.time_text, self.label, 1 if self.enabled else 0, self.id)
-            )
-        conn.commit()
-        conn.close()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if self.id is None:
+                c.execute(
+                    'INSERT INTO free_alarms (time_text, label, enabled) VALUES (?, ?, ?)',
+                    (self.time_text, self.label, 1 if self.enabled else 0)
+                )
+                self.id = c.lastrowid
+            else:
+                c.execute(
+                    'UPDATE free_alarms SET time_text=?, label=?, enabled=? WHERE id=?',
+                    (self.time_text, self.label, 1 if self.enabled else 0, self.id)
+                )
 
     @staticmethod
-    def delete_from_db(id):
-        conn = sqlite3.connect(DB_NAME)
+    @db_operation
+    def delete_from_db(conn, id):
         c = conn.cursor()
         c.execute('DELETE FROM free_alarms WHERE id=?', (id,))
-        conn.commit()
-        conn.close()
 
     @staticmethod
-    def load_all_from_db():
-        conn = sqlite3.connect(DB_NAME)
+    @db_operation
+    def load_all_from_db(conn):
         c = conn.cursor()
         c.execute('SELECT id, time_text, label, enabled FROM free_alarms')
         alarms = []
         for row in c.fetchall():
             alarms.append(FreeAlarm(row[1], row[2], bool(row[3]), row[0]))
-        conn.close()
         # 時刻順に並べ替え
-        def to_minutes(hhmm:str):
-            t = QTime.fromString(hhmm, "HH:mm")
-            return t.hour()*60 + t.minute()
-        alarms.sort(key=lambda a: to_minutes(a.time_text))
+        alarms.sort(key=lambda a: hhmm_to_minutes(a.time_text))
         return alarms
 
 
@@ -387,52 +536,85 @@ class Profile:
         self.id = id
         self.name = name
 
-    def save_profile_to_db(self, conn):
+    def save_to_db(self):
         """プロファイルをデータベースに保存"""
-        c = conn.cursor()
-        if self.id is None:
-            c.execute('''
-                INSERT INTO profiles (name)
-                VALUES (?)
-            ''', (self.name,))
-            self.id = c.lastrowid
-        else:
-            c.execute('''
-                UPDATE profiles
-                SET name=?
-                WHERE id=?
-            ''', (self.name, self.id))
-        conn.commit()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            if self.id is None:
+                c.execute('''
+                    INSERT INTO profiles (name)
+                    VALUES (?)
+                ''', (self.name,))
+                self.id = c.lastrowid
+            else:
+                c.execute('''
+                    UPDATE profiles
+                    SET name=?
+                    WHERE id=?
+                ''', (self.name, self.id))
 
     @staticmethod
-    def load_profiles_from_db():
+    @db_operation
+    def load_profiles_from_db(conn):
         """すべてのプロファイルをデータベースから読み込む"""
-        conn = sqlite3.connect(DB_NAME)
         c = conn.cursor()
         c.execute('SELECT id, name FROM profiles')
         profiles = []
         for row in c.fetchall():
             profile = Profile(row[1], row[0])
             profiles.append(profile)
-        conn.close()
         return profiles
 
     @staticmethod
-    @db_operation
-    def load_all_from_db(conn, profile_id=1):
-        """指定されたプロファイルのスケジュールをデータベースから読み込む"""
-        c = conn.cursor()
-        c.execute('SELECT id, name, start_time, end_time, color FROM schedules WHERE profile_id=?', (profile_id,))
-        return [Schedule(row[1], row[2], row[3], row[4], row[0], profile_id) for row in c.fetchall()]
+    def delete_from_db(id):
+        """指定されたIDのプロファイルと、その配下のスケジュールを削除"""
+        with db_transaction() as conn:
+            c = conn.cursor()
+            c.execute('DELETE FROM schedules WHERE profile_id=?', (id,))
+            c.execute('DELETE FROM profiles WHERE id=?', (id,))
+
+
+class DbLoadSignals(QObject):
+    """DbLoadTask の結果通知用（QRunnable はシグナルを持てないため別オブジェクトにする）"""
+    loaded = Signal(object)
+    failed = Signal(object)
 
 
+class DbLoadTask(QRunnable):
+    """DBの読み込みをワーカースレッドで実行し、結果をシグナルでGUIスレッドへ返す"""
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        # GUIスレッドで生成しておき、受け手側へはキュー接続で届ける
+        self.signals = DbLoadSignals()
+
+    def run(self):
+        # 不正なデータ等どんな例外でも必ずどちらかを通知する（受け手が待ち続けないように）
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.failure_payload(str(e)))
+            return
+        self.signals.loaded.emit(result)
+
+    def failure_payload(self, message):
+        """failed シグナルで送る内容"""
+        return message
+
+
+class LoadSchedulesTask(DbLoadTask):
+    """指定プロファイルのスケジュール読み込み（結果は (profile_id, schedules)、失敗時は (profile_id, message)）"""
+    def __init__(self, profile_id):
+        super().__init__(self._load, profile_id)
+        self.profile_id = profile_id
+
     @staticmethod
-    @db_operation
-    def delete_from_db(conn, id):
-        """指定されたIDのスケジュールを削除"""
-        c = conn.cursor()
-        c.execute('DELETE FROM schedules WHERE id=?', (id,))
-        conn.commit()
+    def _load(profile_id):
+        return profile_id, Schedule.load_all_from_db(profile_id)
+
+    def failure_payload(self, message):
+        return self.profile_id, message
 
 
 class TimeSelectEdit(QTimeEdit):
@@ -599,7 +781,8 @@ class ScheduleListItem(QWidget):
         layout.setContentsMargins(5, 2, 5, 2)
         
         # スケジュール情報のラベル
-        self.label = QLabel(f"{schedule.name} ({schedule.start_time}-{schedule.end_time})")
+        self.label = QLabel()
+        self.refresh(schedule)
         layout.addWidget(self.label)
         
         layout.addStretch()
@@ -616,6 +799,11 @@ class ScheduleListItem(QWidget):
         delete_button.clicked.connect(self.delete_clicked)
         layout.addWidget(delete_button)
 
+    def refresh(self, schedule):
+        """ウィジェットを作り直さずに表示内容だけ更新"""
+        self.schedule = schedule
+        self.label.setText(f"{schedule.name} ({schedule.start_time}-{schedule.end_time})")
+
     def edit_clicked(self):
         """編集ボタンのクリックハンドラ"""
         self.main_window.edit_schedule(self.schedule)
@@ -625,15 +813,94 @@ class ScheduleListItem(QWidget):
         self.main_window.delete_schedule(self.schedule)
 
 
+# 23:59:59 の当日0時からの秒（日をまたぐ予定の経過/残り計算用）
+_LAST_SECOND = 23 * 3600 + 59 * 60 + 59
+
+# タイムバー上の1スケジュール分の描画レイアウト
+LayoutItem = namedtuple(
+    'LayoutItem',
+    ['schedule', 'x_start', 'x_end', 'crosses_midnight', 'y_pos', 'height', 'is_overlapped']
+)
+
+
+def _make_stripe_pen():
+    """背景ストライプ用のペン（デバイスピクセル基準の1px）"""
+    pen = QPen(QColor(180, 180, 180))
+    pen.setWidth(1)
+    pen.setCosmetic(True)  # デバイスピクセル基準で一定幅
+    pen.setCapStyle(Qt.FlatCap)
+    return pen
+
+
+def _make_status_theme(bg, border, main, muted, bar_bg, bar_border):
+    """ステータス欄の描画に使うペン/ブラシ一式"""
+    return {
+        'brush_bg': QBrush(QColor(bg)),
+        'pen_border': QPen(QColor(border)),
+        'pen_main': QPen(QColor(main)),
+        'pen_muted': QPen(QColor(muted)),
+        'brush_bar_bg': QBrush(QColor(bar_bg)),
+        'pen_bar_border': QPen(QColor(bar_border)),
+    }
+
+
 class TimeBarWidget(QWidget):
     """スケジュールバーを描画するウィジェット"""
+    # 描画で使う色・ペン・ブラシ（QFont は QApplication 生成後に作る必要があるためインスタンス側で持つ）
+    _COLOR_BAR_BASE = QColor("#FFFFFF")
+    _PEN_STRIPE = _make_stripe_pen()
+    _PEN_BAR_FRAME = QPen(QColor("#cccccc"))
+    _PEN_SCHEDULE_BORDER = QPen(QColor("#666666"))
+    _PEN_NOW = QPen(QColor("#FF0000"), 3)
+    # テーマ別（キーは is_dark_mode_enabled() の戻り値）
+    _STATUS_THEMES = {
+        True: _make_status_theme("#1e1e1e", "#444444", "#e0e0e0", "#bbbbbb", "#333333", "#555555"),
+        False: _make_status_theme("#f5f5f5", "#cccccc", "#000000", "#666666", "#e0e0e0", "#cccccc"),
+    }
+
     def __init__(self, start_time, schedules, parent=None):
         super().__init__(parent)
         self.start_time = start_time
         self.schedules = schedules
         self.status_height = 60
         self.setMinimumHeight(BAR_HEIGHT + 60 + self.status_height)
+        # 背景は paintEvent で自前で塗るため、Qt による事前の消去を省く
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
         self.highlight_time = QTime.fromString(start_time, "HH:mm")
+        # 基準時刻（0時からの分）。描画時は文字列を解析せずこちらを使う
+        self._start_minutes = hhmm_to_minutes(start_time)
+        # スケジュール配置のキャッシュ（幅・スケジュール一覧が変わるまで再利用）
+        self._layout_cache = None
+        self._layout_key = None
+        # 目盛り・背景・スケジュールバーを描いたピクスマップ（毎秒の描画ではこれを貼るだけ）
+        self._bg_cache = None
+        self._bg_cache_key = None
+        # ピクスマップに描いたステータス欄の枠のテーマ（ダークか）
+        self._status_dark = None
+        # 目盛り（30分刻み49本）のx座標。幅が変わった時だけ再計算
+        self._marker_x = []
+        self._marker_width = None
+        # フォントも描画のたびに生成しない
+        self._label_font = QFont()
+        self._label_font.setPointSize(9)
+        self._status_font = QFont("Arial", 10)
+        # 1時間ごとの目盛りラベル（基準時刻が変わった時だけ再計算）
+        self._update_hour_labels()
+        # 部分再描画用：最後に描いた現在時刻線のx座標と、進行中だったスケジュール -> (経過, 残り)
+        self._last_now_x = None
+        self._last_current = {}
+        # 静的レイヤーの判定キーのうち進行中スケジュール部分（tick で更新し、paintEvent では再走査しない）
+        self._current_items_key = None
+        # ステータス欄の表示内容を決める値（変化した時だけステータス欄を再描画）
+        self._last_status_key = None
+        # スケジュール描画で使う文字色ペンと塗りブラシ（色ごとに1回だけ生成）
+        self._text_pens = {}
+        self._brushes = {}
+        # ヒットテスト用の区間（x_start昇順）。配置キャッシュと同時に作成
+        self._hit_intervals = []
+        self._hit_starts = []
+        self._hit_max_width = 0
         
         # ツールチップ関連の追加
         self.setMouseTracking(True)  # マウストラッキングを有効化
@@ -642,10 +909,25 @@ class TimeBarWidget(QWidget):
         self.tooltip_timer.timeout.connect(self.showScheduleTooltip)
         self.current_schedule = None
         self.tooltip_position = None
+        # 連続したマウス移動をまとめてから判定する（30ms）
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.timeout.connect(self._on_hover_settled)
+        self._hover_pos = None
+        self._hover_global_pos = None
 
     def mouseMoveEvent(self, event):
-        """マウス移動時のイベントハンドラ"""
-        schedule = self._get_schedule_at_position(event.pos())
+        """マウス移動時のイベントハンドラ（判定は少し待ってからまとめて行う）"""
+        self._hover_pos = event.pos()
+        self._hover_global_pos = event.globalPos()
+        if not self.hover_timer.isActive():
+            self.hover_timer.start(30)
+
+    def _on_hover_settled(self):
+        """最後のマウス位置でスケジュールを判定"""
+        if self._hover_pos is None:
+            return
+        schedule = self._get_schedule_at_position(self._hover_pos)
         
         if schedule != self.current_schedule:
             self.tooltip_timer.stop()
@@ -653,7 +935,7 @@ class TimeBarWidget(QWidget):
             
             if schedule:
                 self.current_schedule = schedule
-                self.tooltip_position = event.globalPos()
+                self.tooltip_position = self._hover_global_pos
                 self.tooltip_timer.start(500)  # 500ms後にツールチップを表示
             else:
                 self.current_schedule = None
@@ -661,6 +943,8 @@ class TimeBarWidget(QWidget):
 
     def leaveEvent(self, event):
         """マウスがウィジェットを離れた時のイベントハンドラ"""
+        self.hover_timer.stop()
+        self._hover_pos = None
         self.tooltip_timer.stop()
         QToolTip.hideText()
         self.current_schedule = None
@@ -684,80 +968,79 @@ class TimeBarWidget(QWidget):
             QToolTip.showText(self.tooltip_position, tooltip_text)
 
     def _get_schedule_at_position(self, pos):
-        """指定された位置にあるスケジュールを取得"""
+        """指定された位置にあるスケジュールを取得（最前面に描画されたものを優先）"""
         if not (40 <= pos.y() <= 40 + BAR_HEIGHT):  # バーの範囲外
             return None
         
-        width = self.width()
-        base_time = QTime.fromString(self.start_time, "HH:mm")
-        base_minutes = base_time.hour() * 60 + base_time.minute()
-        
-        # スケジュールを時間長でソート（長い順）
-        sorted_schedules = []
-        for schedule in self.schedules:
-            start_minutes, end_minutes = schedule.get_minutes()
-            duration = end_minutes - start_minutes if end_minutes > start_minutes else (24 * 60 - start_minutes + end_minutes)
-            sorted_schedules.append((schedule, duration))
-        
-        # 長い順にソート
-        sorted_schedules.sort(key=lambda x: -x[1])
-        
-        # まず、短いスケジュールの領域をチェック
-        for schedule, _ in reversed(sorted_schedules):  # 短い順に
-            x_start, x_end, crosses_midnight = self._calculate_schedule_position(
-                schedule, width, base_minutes
-            )
-            
-            is_overlapped = any(self._check_overlap(schedule, s) for s in self.schedules if s != schedule)
-            if is_overlapped:
-                y_pos = 40 + BAR_HEIGHT // 2
-                height = BAR_HEIGHT // 2
-                
-                # X座標の判定
-                x_in_range = False
-                if crosses_midnight:
-                    x_in_range = (0 <= pos.x() <= x_end) or (x_start <= pos.x() <= width)
-                else:
-                    x_in_range = (x_start <= pos.x() <= x_end)
-                    
-                # 短いスケジュールの領域内ならそれを返す
-                if x_in_range and (y_pos <= pos.y() <= y_pos + height):
-                    return schedule
-        
-        # 短いスケジュールの領域になければ、長いスケジュールをチェック
-        for schedule, _ in sorted_schedules:  # 長い順に
-            x_start, x_end, crosses_midnight = self._calculate_schedule_position(
-                schedule, width, base_minutes
-            )
-            
-            is_overlapped = any(self._check_overlap(schedule, s) for s in self.schedules if s != schedule)
-            y_pos = 40
-            height = BAR_HEIGHT if not is_overlapped else BAR_HEIGHT // 2
-            
-            # X座標の判定
-            x_in_range = False
-            if crosses_midnight:
-                x_in_range = (0 <= pos.x() <= x_end) or (x_start <= pos.x() <= width)
-            else:
-                x_in_range = (x_start <= pos.x() <= x_end)
-                
-            # 長いスケジュールの領域内ならそれを返す
-            if x_in_range and (y_pos <= pos.y() <= y_pos + height):
-                return schedule
-        
-        return None
+        self._get_layout()  # 必要ならヒットテスト用の区間も再構築
+        x = pos.x()
+        y = pos.y()
+        
+        # x_start <= x の区間だけを、最大幅の範囲内で後ろから調べる
+        best = None
+        i = bisect.bisect_right(self._hit_starts, x) - 1
+        while i >= 0 and self._hit_starts[i] >= x - self._hit_max_width:
+            x_start, x_end, order, item = self._hit_intervals[i]
+            if (x <= x_end and item.y_pos <= y <= item.y_pos + item.height
+                    and (best is None or order > best[0])):
+                best = (order, item.schedule)
+            i -= 1
+        return best[1] if best else None
 
     def set_start_time(self, time_str):
         """開始時刻を設定し、その位置をハイライト表示"""
         self.start_time = time_str
         self.highlight_time = QTime.fromString(time_str, "HH:mm")
-        self.repaint()
-
-    def _get_time_info(self, schedule):
-        """スケジュールの経過時間と残り時間を計算"""
-        now = QTime.currentTime()
-        start = QTime.fromString(schedule.start_time, "HH:mm")
-        end = QTime.fromString(schedule.end_time, "HH:mm")
+        self._start_minutes = hhmm_to_minutes(time_str)
+        self._invalidate_cache()
+        self._recompute_geometry()
+        self._update_hour_labels()
+        self.update()
+
+    def set_schedules(self, schedules):
+        """表示するスケジュール一覧を差し替えて再描画"""
+        self.schedules = schedules
+        self._invalidate_cache()
+        self._recompute_geometry()
+        self.update()
+
+    def resizeEvent(self, event):
+        """サイズ変更時はキャッシュを破棄し、目盛り位置を再計算"""
+        self._invalidate_cache()
+        self._recompute_geometry()
+        self._update_marker_x(event.size().width())
+        super().resizeEvent(event)
+
+    def _update_hour_labels(self):
+        """基準時刻から25個の時刻ラベルを作成（レイアウト済みの QStaticText として保持）"""
+        base_hour, minute = divmod(self._start_minutes, 60)
+        self._hour_labels = []
+        for i in range(25):
+            text = QStaticText(f"{(base_hour + i) % 24:02d}:{minute:02d}")
+            text.setTextFormat(Qt.PlainText)
+            text.prepare(QTransform(), self._label_font)
+            self._hour_labels.append(text)
+        # drawText はベースライン基準、drawStaticText は左上基準なので上端のyを求めておく
+        self._hour_label_top = 25 - QFontMetrics(self._label_font).ascent()
+
+    def _update_marker_x(self, width):
+        """30分刻みの目盛りのx座標を幅から一括計算"""
+        self._marker_x = [(i * 30 * width) // (24 * 60) for i in range(49)]
+        self._marker_width = width
+
+    def _get_time_info(self, schedule, now_ms=None):
+        """スケジュールの経過時間と残り時間を計算
+
+        now_ms は当日0時からのミリ秒。ループ内で呼ぶ場合は一度だけ取得して渡す。
+        """
+        if now_ms is None:
+            now_ms = QTime.currentTime().msecsSinceStartOfDay()
+        start_ms = schedule._start_minutes * 60000
+        end_ms = schedule._end_minutes * 60000
+        # 経過/残りは QTime.secsTo と同じく秒未満を切り捨てた秒で計算する
+        now_s = now_ms // 1000
+        start_s = schedule._start_minutes * 60
+        end_s = schedule._end_minutes * 60
         
         # 現在時刻がスケジュール時間内かチェック
         is_current = False
@@ -765,27 +1048,27 @@ class TimeBarWidget(QWidget):
         remaining_minutes = 0
         
         # 日をまたぐケース対応
-        if end < start:
+        if end_ms < start_ms:
             # スケジュールが日をまたぐ場合
-            if now >= start or now <= end:
+            if now_ms >= start_ms or now_ms <= end_ms:
                 is_current = True
-                if now >= start:
-                    elapsed_minutes = start.secsTo(now) // 60
+                if now_ms >= start_ms:
+                    elapsed_minutes = (now_s - start_s) // 60
                 else:
                     # 日をまたいでからの経過時間
-                    elapsed_minutes = (start.secsTo(QTime(23, 59, 59)) + 60 + QTime(0, 0).secsTo(now)) // 60
+                    elapsed_minutes = (_LAST_SECOND - start_s + 60 + now_s) // 60
                 
-                if now <= end:
-                    remaining_minutes = now.secsTo(end) // 60
+                if now_ms <= end_ms:
+                    remaining_minutes = (end_s - now_s) // 60
                 else:
                     # 次の日の終了時刻までの残り時間
-                    remaining_minutes = (now.secsTo(QTime(23, 59, 59)) + 60 + QTime(0, 0).secsTo(end)) // 60
+                    remaining_minutes = (_LAST_SECOND - now_s + 60 + end_s) // 60
         else:
             # 通常のケース
-            if start <= now <= end:
+            if start_ms <= now_ms <= end_ms:
                 is_current = True
-                elapsed_minutes = start.secsTo(now) // 60
-                remaining_minutes = now.secsTo(end) // 60
+                elapsed_minutes = (now_s - start_s) // 60
+                remaining_minutes = (end_s - now_s) // 60
         
         return is_current, elapsed_minutes, remaining_minutes
 
@@ -801,35 +1084,106 @@ class TimeBarWidget(QWidget):
         """スケジュールバーの描画"""
         painter = QPainter(self)
         try:
-            painter.setRenderHint(QPainter.Antialiasing)
-            font = QFont()
-            font.setPointSize(9)
-            painter.setFont(font)
+            # 静的な部分はキャッシュしたピクスマップを貼る（ウィジェット全体を覆うので背景消去も不要）
+            key = self._static_layer_key()
+            if self._bg_cache is None or key != self._bg_cache_key:
+                self._bg_cache = self._render_static_layer()
+                self._bg_cache_key = key
+            painter.drawPixmap(0, 0, self._bg_cache)
             
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setFont(self._label_font)
+            self._draw_current_time(painter)
+            if event.region().intersects(QRect(0, BAR_HEIGHT + 50, self.width(), self.status_height)):
+                self._draw_current_status(painter)
+        finally:
+            painter.end()
+
+    def _invalidate_cache(self):
+        """配置キャッシュと静的レイヤーのピクスマップを破棄"""
+        self._layout_cache = None
+        self._bg_cache = None
+        self._current_items_key = None
+
+    def _static_layer_key(self):
+        """静的レイヤーの有効性判定キー（サイズと、進行中スケジュールの経過/残り表示）"""
+        if self._current_items_key is None:
+            current = []
+            now_ms = QTime.currentTime().msecsSinceStartOfDay()
+            for order, item in enumerate(self._get_layout()):
+                is_current, elapsed, remaining = self._get_time_info(item.schedule, now_ms)
+                if is_current:
+                    current.append((order, elapsed, remaining))
+            self._current_items_key = tuple(current)
+        return (self.width(), self.height(), self._current_items_key)
+
+    def _render_static_layer(self):
+        """目盛り・バー背景・スケジュールをピクスマップに描画"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(self.palette().window().color())
+        painter = QPainter(pixmap)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setFont(self._label_font)
             self._draw_time_markers(painter)
             self._draw_bar_background(painter)
             self._draw_schedules(painter)
-            self._draw_current_time(painter)
-            self._draw_current_status(painter)
+            self._draw_status_frame(painter)
         finally:
             painter.end()
+        return pixmap
+
+    def _draw_status_frame(self, painter):
+        """ステータス欄の背景と枠（枠は毎秒の描画では描き直さない）"""
+        self._status_dark = bool(is_dark_mode_enabled())
+        theme = self._STATUS_THEMES[self._status_dark]
+        painter.setPen(theme['pen_border'])
+        painter.setBrush(theme['brush_bg'])
+        painter.drawRect(QRect(0, BAR_HEIGHT + 50, self.width(), self.status_height))
+
+    def tick(self):
+        """時刻の経過で変わる領域（現在時刻線・進行中の予定・ステータス欄）だけを再描画"""
+        now_x = self._get_now_x()
+        old_x = self._last_now_x if self._last_now_x is not None else now_x
+        left = min(now_x, old_x)
+        self.update(QRect(left - 3, 28, abs(now_x - old_x) + 7, BAR_HEIGHT + 15))
+        
+        # 進行中の予定は、経過/残り（分）が変わった時と進行中になった/外れた時だけ再描画
+        current = {}
+        status_items = []
+        items_key = []
+        now_ms = QTime.currentTime().msecsSinceStartOfDay()
+        for order, item in enumerate(self._get_layout()):
+            is_current, elapsed, remaining = self._get_time_info(item.schedule, now_ms)
+            if is_current:
+                current[item] = (elapsed, remaining)
+                status_items.append((item.schedule.id, elapsed, remaining))
+                items_key.append((order, elapsed, remaining))
+        last_current = self._last_current
+        for item in current.keys() | last_current.keys():
+            if current.get(item) != last_current.get(item):
+                for rect in self._item_rects(item):
+                    self.update(rect)
+        self._last_current = current
+        self._current_items_key = tuple(items_key)
+        
+        # ステータス欄は分単位の表示なので、進行中の予定・経過/残り・現在の分が変わった時だけ
+        status_key = (now_ms // 60000, tuple(status_items))
+        if status_key != self._last_status_key:
+            self._last_status_key = status_key
+            self.update(QRect(0, BAR_HEIGHT + 50, self.width(), self.status_height))
 
     def _draw_time_markers(self, painter):
         """時間目盛りの描画"""
-        width = self.width()
-        base_time = QTime.fromString(self.start_time, "HH:mm")
+        if self._marker_width != self.width():
+            self._update_marker_x(self.width())
         
-        for i in range(49):  # 24時間 × 2（30分刻み）+ 1
-            minutes = i * 30
-            time = base_time.addSecs(minutes * 60)
-            if time.hour() >= 24:
-                time = time.addSecs(-24 * 3600)
-                
-            x = (minutes * width) // (24 * 60)
-            
+        for i, x in enumerate(self._marker_x):  # 24時間 × 2（30分刻み）+ 1
             if i % 2 == 0:  # 1時間ごと
                 painter.drawLine(x, 30, x, 40)
-                painter.drawText(x - 15, 25, time.toString("HH:mm"))
+                painter.drawStaticText(x - 15, self._hour_label_top, self._hour_labels[i // 2])
             else:  # 30分ごと
                 painter.drawLine(x, 35, x, 40)
 
@@ -838,18 +1192,14 @@ class TimeBarWidget(QWidget):
         background_rect = QRect(0, 40, self.width(), BAR_HEIGHT)
 
         # ベース（白）
-        painter.fillRect(background_rect, QColor("#FFFFFF"))
+        painter.fillRect(background_rect, self._COLOR_BAR_BASE)
 
         # 予定が無い時間帯に見えるよう、全体へ薄い斜めストライプを敷く
         painter.save()
         # タイル敷き詰めはDPIスケーリングで粒状化しやすいため、
         # 直接等間隔の斜線を描画して一様な見た目にする
         painter.setClipRect(background_rect)
-        pen = QPen(QColor(180, 180, 180))
-        pen.setWidth(1)
-        pen.setCosmetic(True)  # デバイスピクセル基準で一定幅
-        pen.setCapStyle(Qt.FlatCap)
-        painter.setPen(pen)
+        painter.setPen(self._PEN_STRIPE)
         spacing = 7  # ストライプ間隔(px)
         left = background_rect.left()
         right = background_rect.right()
@@ -871,120 +1221,147 @@ class TimeBarWidget(QWidget):
         painter.restore()
 
         # 外枠
-        painter.setPen(QPen(QColor("#cccccc")))
+        painter.setPen(self._PEN_BAR_FRAME)
         painter.setBrush(Qt.NoBrush)
         painter.drawRect(background_rect)
 
     def _draw_schedules(self, painter):
         """全スケジュールの描画"""
+        # 重なったバーは後から描いたものが上になるため、描画順は配置順のまま変えない
+        now_ms = QTime.currentTime().msecsSinceStartOfDay()
+        for item in self._get_layout():
+            for rect in self._item_rects(item):
+                self._draw_schedule_rect(painter, rect, item.schedule, item.is_overlapped, now_ms)
+
+    def _item_rects(self, item):
+        """配置から描画矩形を返す（日をまたぐ場合は右端と左端の2つ）"""
+        if item.crosses_midnight:
+            return (
+                QRect(item.x_start, item.y_pos, self.width() - item.x_start, item.height),
+                QRect(0, item.y_pos, item.x_end, item.height),
+            )
+        return (QRect(item.x_start, item.y_pos, item.x_end - item.x_start, item.height),)
+
+    def _get_layout(self):
+        """配置キャッシュを返す（幅・スケジュール一覧が変わった時のみ再計算）"""
+        key = (self.width(), id(self.schedules), len(self.schedules))
+        if self._layout_cache is None or key != self._layout_key:
+            self._recompute_geometry()
+        return self._layout_cache
+
+    def _recompute_geometry(self):
+        """配置とヒットテスト用区間を計算し直す（スケジュール・基準時刻・幅の変更時に呼ぶ）"""
         width = self.width()
-        base_time = QTime.fromString(self.start_time, "HH:mm")
-        base_minutes = base_time.hour() * 60 + base_time.minute()
+        self._layout_cache = self._build_layout(width)
+        self._layout_key = (width, id(self.schedules), len(self.schedules))
+        self._build_hit_intervals(self._layout_cache, width)
+
+    def _build_hit_intervals(self, layout, width):
+        """ヒットテスト用に描画矩形のx区間を x_start 昇順で並べる（日またぎは2区間）"""
+        intervals = []
+        for order, item in enumerate(layout):
+            if item.crosses_midnight:
+                intervals.append((item.x_start, width, order, item))
+                intervals.append((0, item.x_end, order, item))
+            else:
+                intervals.append((item.x_start, item.x_end, order, item))
+        intervals.sort(key=lambda iv: iv[0])
+        self._hit_intervals = intervals
+        self._hit_starts = [iv[0] for iv in intervals]
+        self._hit_max_width = max((iv[1] - iv[0] for iv in intervals), default=0)
+
+    def _build_layout(self, width):
+        """スケジュールの並び順・重なり・描画位置をまとめて計算"""
+        base_minutes = self._start_minutes
         
         # スケジュールを時間長でソート（長い順）
         sorted_schedules = []
         for schedule in self.schedules:
-            start = QTime.fromString(schedule.start_time, "HH:mm")
-            end = QTime.fromString(schedule.end_time, "HH:mm")
-            start_minutes, end_minutes = schedule.get_minutes()
-            duration = end_minutes - start_minutes if end_minutes > start_minutes else (24 * 60 - start_minutes + end_minutes)
-            sorted_schedules.append((schedule, duration))
+            sorted_schedules.append((schedule, schedule._duration_minutes))
         
         # 長い順にソート
         sorted_schedules.sort(key=lambda x: (-x[1], x[0].start_time))
         
-        # まず長いスケジュールを描画
-        for i, (schedule1, duration1) in enumerate(sorted_schedules):
-            # 他のスケジュールとの重なりをチェック
-            is_overlapped = False
-            for schedule2, duration2 in sorted_schedules[:i]:  # 自分より前（長い）スケジュールとチェック
-                if self._check_overlap(schedule1, schedule2):
-                    is_overlapped = True
-                    break
-            
+        # 重なり判定（自分より長いスケジュールと5分以上重なれば下段）を
+        # 開始時刻順のスイープで行う。アクティブな区間は重なりの深さ分だけ保持される
+        ranked = [
+            (schedule._start_minutes,
+             schedule._end_minutes + (24 * 60 if schedule._end_minutes < schedule._start_minutes else 0),
+             rank)
+            for rank, (schedule, _) in enumerate(sorted_schedules)
+        ]
+        ranked.sort()
+        overlapped = [False] * len(ranked)
+        active = []  # (終了分, 順位)
+        for start_minutes, end_minutes, rank in ranked:
+            # 以降のスケジュールとも5分以上重ならない区間は除外
+            active = [(e, r) for e, r in active if e - start_minutes >= 5]
+            if end_minutes - start_minutes >= 5:
+                for _, other_rank in active:
+                    # 短い（順位が後ろの）方を下段にする
+                    overlapped[max(rank, other_rank)] = True
+            active.append((end_minutes, rank))
+        
+        layout = []
+        for rank, (schedule, _) in enumerate(sorted_schedules):
+            is_overlapped = overlapped[rank]
             x_start, x_end, crosses_midnight = self._calculate_schedule_position(
-                schedule1, width, base_minutes
+                schedule, width, base_minutes
             )
             
             # 重なっている場合は下部に配置
             y_pos = 40 + (BAR_HEIGHT // 2 if is_overlapped else 0)
             height = BAR_HEIGHT // 2 if is_overlapped else BAR_HEIGHT
-            
-            if crosses_midnight:
-                self._draw_schedule_rect(
-                    painter,
-                    QRect(x_start, y_pos, width - x_start, height),
-                    schedule1,
-                    is_overlapped
-                )
-                self._draw_schedule_rect(
-                    painter,
-                    QRect(0, y_pos, x_end, height),
-                    schedule1,
-                    is_overlapped
-                )
-            else:
-                self._draw_schedule_rect(
-                    painter,
-                    QRect(x_start, y_pos, x_end - x_start, height),
-                    schedule1,
-                    is_overlapped
-                )
-
-    def _check_overlap(self, schedule1, schedule2):
-        """2つのスケジュール間の重なりをチェック（5分以上の重なりがある場合にTrue）"""
-        start1_minutes, end1_minutes = schedule1.get_minutes()
-        start2_minutes, end2_minutes = schedule2.get_minutes()
-        
-        # 日をまたぐ場合の調整
-        if end1_minutes < start1_minutes:
-            end1_minutes += 24 * 60
-        if end2_minutes < start2_minutes:
-            end2_minutes += 24 * 60
-        
-        # 重なりの判定
-        overlap_start = max(start1_minutes, start2_minutes)
-        overlap_end = min(end1_minutes, end2_minutes)
-        
-        return overlap_end - overlap_start >= 5
-
-    def _draw_schedule_rect(self, painter, rect, schedule, is_overlapped):
+            layout.append(LayoutItem(
+                schedule, x_start, x_end, crosses_midnight, y_pos, height, is_overlapped
+            ))
+        return layout
+
+    def _get_brush(self, color, translucent=False):
+        """色ごとの塗りブラシを返す（translucent なら半透明版）"""
+        key = (color.rgba(), translucent)
+        brush = self._brushes.get(key)
+        if brush is None:
+            if translucent:
+                color = QColor(color)
+                color.setAlpha(200)  # 透明度を設定
+            brush = self._brushes.setdefault(key, QBrush(color))
+        return brush
+
+    def _draw_schedule_rect(self, painter, rect, schedule, is_overlapped, now_ms=None):
         """個別のスケジュール矩形の描画"""
         # 境界線の幅を1ピクセル確保
         adjusted_rect = rect.adjusted(1, 1, -1, -1)
         
         # 重なっている場合は半透明に
-        color = QColor(schedule.color)
-        if is_overlapped:
-            color.setAlpha(200)  # 透明度を設定
-        painter.setBrush(QBrush(color))
-        painter.setPen(QPen(QColor("#666666")))
+        painter.setBrush(self._get_brush(schedule._qcolor, is_overlapped))
+        painter.setPen(self._PEN_SCHEDULE_BORDER)
         painter.drawRect(adjusted_rect)
         
-        # テキストの描画
-        text_color = get_complementary_color(schedule.color)
-        painter.setPen(QPen(text_color))
+        # テキストの描画（文字色は白/黒のみなのでペンを使い回す）
+        text_color = schedule._text_color
+        text_pen = self._text_pens.get(text_color.rgba())
+        if text_pen is None:
+            text_pen = self._text_pens.setdefault(text_color.rgba(), QPen(text_color))
+        painter.setPen(text_pen)
         
         # 経過時間と残り時間の計算
-        is_current, elapsed_minutes, remaining_minutes = self._get_time_info(schedule)
+        is_current, elapsed_minutes, remaining_minutes = self._get_time_info(schedule, now_ms)
         
         # テキスト表示位置の調整
         text_rect = adjusted_rect.adjusted(2, 2, -2, -2)
         
         # 領域の幅に応じてテキストの表示方法を変更
         if adjusted_rect.width() >= 150:
-            if is_overlapped:
-                schedule_text = f"{schedule.name}\n{schedule.start_time}-{schedule.end_time}"
-            else:
-                schedule_text = f"{schedule.name}\n{schedule.start_time}-{schedule.end_time}"
-                if is_current:
-                    elapsed_str = self._format_time(elapsed_minutes)
-                    remaining_str = self._format_time(remaining_minutes)
-                    schedule_text += f"\n経過: {elapsed_str} / 残り: {remaining_str}"
+            schedule_text = schedule._label_long
+            if is_current and not is_overlapped:
+                elapsed_str = self._format_time(elapsed_minutes)
+                remaining_str = self._format_time(remaining_minutes)
+                schedule_text += f"\n経過: {elapsed_str} / 残り: {remaining_str}"
         elif adjusted_rect.width() >= 100:
-            schedule_text = f"{schedule.name}\n{schedule.start_time}-{schedule.end_time}"
+            schedule_text = schedule._label_long
         elif adjusted_rect.width() >= 45:
-            schedule_text = f"{schedule.name}\n{schedule.start_time}"
+            schedule_text = schedule._label_short
         else:
             schedule_text = schedule.name
         
@@ -992,11 +1369,8 @@ class TimeBarWidget(QWidget):
 
     def _calculate_schedule_position(self, schedule, width, base_minutes):
         """スケジュールの描画位置を計算"""
-        start = QTime.fromString(schedule.start_time, "HH:mm")
-        end = QTime.fromString(schedule.end_time, "HH:mm")
-        
-        start_minutes = (start.hour() * 60 + start.minute()) - base_minutes
-        end_minutes = (end.hour() * 60 + end.minute()) - base_minutes
+        start_minutes = schedule._start_minutes - base_minutes
+        end_minutes = schedule._end_minutes - base_minutes
         
         # 日をまたぐ場合の調整
         if start_minutes < 0:
@@ -1009,22 +1383,23 @@ class TimeBarWidget(QWidget):
         
         return x_start, x_end, end_minutes < start_minutes
 
-    def _draw_current_time(self, painter):
-        """現在時刻の赤線描画"""
+    def _get_now_x(self):
+        """現在時刻線のx座標"""
         width = self.width()
-        base_time = QTime.fromString(self.start_time, "HH:mm")
-        base_minutes = base_time.hour() * 60 + base_time.minute()
-        
-        now = QTime.currentTime()
-        now_minutes = now.hour() * 60 + now.minute()
-        diff_minutes = now_minutes - base_minutes
+        now_minutes = QTime.currentTime().msecsSinceStartOfDay() // 60000
+        diff_minutes = now_minutes - self._start_minutes
         
         if diff_minutes < 0:
             diff_minutes += 24 * 60
         
-        now_x = (diff_minutes * width) // (24 * 60)
-        painter.setPen(QPen(QColor("#FF0000"), 3))
+        return (diff_minutes * width) // (24 * 60)
+
+    def _draw_current_time(self, painter):
+        """現在時刻の赤線描画"""
+        now_x = self._get_now_x()
+        painter.setPen(self._PEN_NOW)
         painter.drawLine(now_x, 30, now_x, BAR_HEIGHT + 40)
+        self._last_now_x = now_x
 
     def _draw_current_status(self, painter):
         """現在のスケジュールの状態表示"""
@@ -1032,86 +1407,73 @@ class TimeBarWidget(QWidget):
         status_y = BAR_HEIGHT + 50  # ステータスセクションのY位置
         
         # テーマ別カラー設定
-        dark = is_dark_mode_enabled()
-        if dark:
-            status_bg = QColor("#1e1e1e")
-            status_border = QColor("#444444")
-            text_main = QColor("#e0e0e0")
-            text_muted = QColor("#bbbbbb")
-            bar_bg = QColor("#333333")
-            bar_border = QColor("#555555")
-        else:
-            status_bg = QColor("#f5f5f5")
-            status_border = QColor("#cccccc")
-            text_main = QColor("#000000")
-            text_muted = QColor("#666666")
-            bar_bg = QColor("#e0e0e0")
-            bar_border = QColor("#cccccc")
-
-        # ステータス背景の描画
+        dark = bool(is_dark_mode_enabled())
+        theme = self._STATUS_THEMES[dark]
+        if dark != self._status_dark:
+            # テーマが変わったらキャッシュ側の枠も描き直す
+            self._bg_cache = None
+            self.update()
+
+        # ステータス背景の描画（枠はキャッシュ済みなので内側だけ塗る）
         status_rect = QRect(0, status_y, self.width(), self.status_height)
-        painter.setPen(QPen(status_border))
-        painter.setBrush(QBrush(status_bg))
-        painter.drawRect(status_rect)
+        painter.fillRect(status_rect.adjusted(1, 1, -1, -1), theme['brush_bg'])
         
         # 現在進行中のスケジュールを探す
         current_schedules = []
+        now_ms = now.msecsSinceStartOfDay()
         for schedule in self.schedules:
-            is_current, elapsed_minutes, remaining_minutes = self._get_time_info(schedule)
+            is_current, elapsed_minutes, remaining_minutes = self._get_time_info(schedule, now_ms)
             if is_current:
                 current_schedules.append((schedule, elapsed_minutes, remaining_minutes))
         
         if current_schedules:
-            # 複数のスケジュールがある場合は横に並べて表示
+            # 複数のスケジュールがある場合は横に並べて表示（余りの幅は先頭から1pxずつ配る）
             total_width = self.width()
-            schedule_width = total_width / len(current_schedules)
+            base_width, extra = divmod(total_width, len(current_schedules))
             
             for i, (schedule, elapsed, remaining) in enumerate(current_schedules):
-                x = i * schedule_width
+                x = i * base_width + min(i, extra)
+                schedule_width = base_width + (1 if i < extra else 0)
                 
                 # スケジュール名と時間情報を同じ行に表示するための矩形
-                text_rect = QRect(int(x) + 5, status_y + 5, int(schedule_width) - 10, 20)
+                text_rect = QRect(x + 5, status_y + 5, schedule_width - 10, 20)
                 
                 # 結合したテキストを作成
                 combined_text = f"[ {schedule.name} ]  ⏱ {self._format_time(elapsed)}  ➡  残り {self._format_time(remaining)}"
                 
                 # テキストを描画
-                painter.setFont(QFont("Arial", 10))
-                painter.setPen(QPen(text_main))
+                painter.setFont(self._status_font)
+                painter.setPen(theme['pen_main'])
                 painter.drawText(text_rect, Qt.AlignCenter, combined_text)
                 
                 # プログレスバーの描画
                 total_duration = elapsed + remaining
-                progress = elapsed / total_duration if total_duration > 0 else 0
                 
                 # プログレスバーの背景
-                bar_rect = QRect(int(x) + 10, status_y + 30, int(schedule_width) - 20, 6)
-                painter.setBrush(QBrush(bar_bg))
-                painter.setPen(QPen(bar_border))
+                bar_rect = QRect(x + 10, status_y + 30, schedule_width - 20, 6)
+                painter.fillRect(bar_rect, theme['brush_bar_bg'])
+                painter.setPen(theme['pen_bar_border'])
+                painter.setBrush(Qt.NoBrush)
                 painter.drawRect(bar_rect)
                 
-                # プログレスバーの進捗
-                progress_width = int((bar_rect.width()) * progress)
+                # プログレスバーの進捗（整数演算で毎回同じ幅になるようにする）
+                progress_width = bar_rect.width() * elapsed // total_duration if total_duration > 0 else 0
                 if progress_width > 0:
                     progress_rect = QRect(bar_rect.x(), bar_rect.y(), 
                                         progress_width, bar_rect.height())
-                    painter.setBrush(QBrush(QColor(schedule.color)))
-                    painter.setPen(Qt.NoPen)
-                    painter.drawRect(progress_rect)
+                    painter.fillRect(progress_rect, self._get_brush(schedule._qcolor))
             # 下段に「次のフリーアラーム」を併記
             try:
                 alarms = FreeAlarm.load_all_from_db()
             except Exception:
                 alarms = []
-            now_minutes = QTime.currentTime().hour()*60 + QTime.currentTime().minute()
+            now_minutes = now_ms // 60000
             next_alarm = None
             min_alarm_delta = None
             for alarm in alarms:
                 if not alarm.enabled:
                     continue
-                t = QTime.fromString(alarm.time_text, "HH:mm")
-                tmin = t.hour()*60 + t.minute()
-                delta = tmin - now_minutes
+                delta = hhmm_to_minutes(alarm.time_text) - now_minutes
                 if delta <= 0:
                     delta += 24*60
                 if (min_alarm_delta is None) or (delta < min_alarm_delta):
@@ -1121,21 +1483,18 @@ class TimeBarWidget(QWidget):
                 label = next_alarm.label if next_alarm.label else "アラーム"
                 remaining_alarm_text = self._format_time(min_alarm_delta)
                 sub_rect = QRect(5, status_y + 40, self.width() - 10, 16)
-                painter.setPen(QPen(text_muted))
+                painter.setPen(theme['pen_muted'])
                 painter.drawText(sub_rect, Qt.AlignCenter, f"次のフリーアラーム: [ {label} ] {next_alarm.time_text} ➡ 残り {remaining_alarm_text}")
         else:
             # 予定がない時間帯 → 次の予定やフリーアラームまでの残り時間を表示
-            painter.setPen(QPen(text_muted))
+            painter.setPen(theme['pen_muted'])
             if self.schedules:
-                now_time = QTime.currentTime()
-                now_minutes = now_time.hour() * 60 + now_time.minute()
+                now_minutes = now_ms // 60000
 
                 next_schedule = None
                 min_delta = None
                 for schedule in self.schedules:
-                    start = QTime.fromString(schedule.start_time, "HH:mm")
-                    start_minutes = start.hour() * 60 + start.minute()
-                    delta = start_minutes - now_minutes
+                    delta = schedule._start_minutes - now_minutes
                     if delta <= 0:
                         delta += 24 * 60
                     if (min_delta is None) or (delta < min_delta):
@@ -1152,9 +1511,7 @@ class TimeBarWidget(QWidget):
                 for alarm in alarms:
                     if not alarm.enabled:
                         continue
-                    t = QTime.fromString(alarm.time_text, "HH:mm")
-                    tmin = t.hour() * 60 + t.minute()
-                    delta = tmin - now_minutes
+                    delta = hhmm_to_minutes(alarm.time_text) - now_minutes
                     if delta <= 0:
                         delta += 24 * 60
                     if (min_alarm_delta is None) or (delta < min_alarm_delta):
@@ -1181,15 +1538,13 @@ class TimeBarWidget(QWidget):
                     alarms = FreeAlarm.load_all_from_db()
                 except Exception:
                     alarms = []
-                now_minutes = QTime.currentTime().hour()*60 + QTime.currentTime().minute()
+                now_minutes = now_ms // 60000
                 next_alarm = None
                 min_alarm_delta = None
                 for alarm in alarms:
                     if not alarm.enabled:
                         continue
-                    t = QTime.fromString(alarm.time_text, "HH:mm")
-                    tmin = t.hour()*60 + t.minute()
-                    delta = tmin - now_minutes
+                    delta = hhmm_to_minutes(alarm.time_text) - now_minutes
                     if delta <= 0:
                         delta += 24*60
                     if (min_alarm_delta is None) or (delta < min_alarm_delta):
@@ -1203,6 +1558,31 @@ class TimeBarWidget(QWidget):
                     painter.drawText(status_rect, Qt.AlignCenter, "現在進行中のスケジュールはありません")
 
 
+class DatabaseTableModel(QAbstractTableModel):
+    """fetchall() の結果をそのまま保持し、表示時に必要なセルだけ返すモデル"""
+    def __init__(self, rows, column_names, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+        self._column_names = column_names
+
+    def rowCount(self, parent=None):
+        return len(self._rows)
+
+    def columnCount(self, parent=None):
+        return len(self._column_names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        # 文字列化は表示中のセルについて Qt が問い合わせた時だけ行う
+        if role == Qt.DisplayRole and index.isValid():
+            return str(self._rows[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._column_names[section]
+        return super().headerData(section, orientation, role)
+
+
 class DatabaseViewer(QDialog):
     """データベース内容を表示するダイアログ"""
     def __init__(self, parent=None):
@@ -1211,30 +1591,39 @@ class DatabaseViewer(QDialog):
         self.setModal(True)
         layout = QVBoxLayout(self)
 
-        # テーブルウィジェットを追加
-        self.table_widget = QTableWidget()
-        layout.addWidget(self.table_widget)
+        # テーブルビューを追加（セルごとのアイテムは作らずモデルから表示する）
+        self.table_view = QTableView()
+        # 行の高さは固定にして行ごとのサイズ計算を省き、横スクロールはピクセル単位にする
+        self.table_view.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.table_view.verticalHeader().setDefaultSectionSize(20)
+        layout.addWidget(self.table_view)
 
         # データベースの内容を読み込む
         self.load_database_content()
 
     def load_database_content(self):
-        """データベースの内容をテーブルに読み込む"""
-        conn = sqlite3.connect(DB_NAME)
-        c = conn.cursor()
-        c.execute('SELECT * FROM schedules')
-        rows = c.fetchall()
-        column_names = [description[0] for description in c.description]
+        """データベースの内容をワーカースレッドで読み込み、終わったらテーブルに表示"""
+        task = DbLoadTask(self._fetch_schedules_table)
+        task.signals.loaded.connect(self._on_content_loaded)
+        task.signals.failed.connect(self._on_content_failed)
+        QThreadPool.globalInstance().start(task)
 
-        self.table_widget.setRowCount(len(rows))
-        self.table_widget.setColumnCount(len(column_names))
-        self.table_widget.setHorizontalHeaderLabels(column_names)
+    @staticmethod
+    def _fetch_schedules_table():
+        """schedules テーブルの全行と列名を返す（ワーカースレッドで実行）"""
+        with get_db_connection() as conn:
+            c = conn.execute('SELECT * FROM schedules')
+            rows = c.fetchall()
+            column_names = [description[0] for description in c.description]
+        return rows, column_names
 
-        for row_index, row_data in enumerate(rows):
-            for column_index, data in enumerate(row_data):
-                self.table_widget.setItem(row_index, column_index, QTableWidgetItem(str(data)))
+    def _on_content_loaded(self, result):
+        rows, column_names = result
+        self.model = DatabaseTableModel(rows, column_names, self)
+        self.table_view.setModel(self.model)
 
-        conn.close()
+    def _on_content_failed(self, message):
+        QMessageBox.warning(self, "エラー", f"データベースの読み込みに失敗しました: {message}")
 
 
 class FreeAlarmItemWidget(QWidget):
@@ -1369,12 +1758,23 @@ class MainWindow(QMainWindow):
         
         # 保存されたプロファイルIDを読み込む
         self.current_profile_id = self.load_last_profile_id()
+        # プロファイルIDの保存は連続した変更をまとめて1回にする
+        self._save_debounce = QTimer(self)
+        self._save_debounce.setSingleShot(True)
+        self._save_debounce.setInterval(500)
+        self._save_debounce.timeout.connect(self.save_last_profile_id)
         
         # ウィンドウ位置の復元
         restore_position(self)
         
         # 初期化
         self.schedules = Schedule.load_all_from_db(self.current_profile_id)
+        # プロファイルID -> スケジュール一覧（一覧はその場で更新されるので常に最新）
+        self._schedule_cache = {self.current_profile_id: self.schedules}
+        # ワーカースレッドで読み込み中のプロファイルID（読み込み中でなければ None）
+        self._loading_profile_id = None
+        # 画面に表示中で、内容がDBと一致しているプロファイルID（読み込み失敗時の戻り先）
+        self._displayed_profile_id = self.current_profile_id
         self.start_time = DEFAULT_START_TIME
         
         # メインウィジェットとレイアウトの設定
@@ -1450,9 +1850,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.timebar)
         
         # タイマーの設定
+        # 秒の境界に合わせて単発で再設定する（ずれの蓄積と1秒2回の描画を防ぐ）
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.update_clock)
-        self.timer.start(1000)  # 1秒ごとに更新
         
         # ポモドーロ管理用タイマー
         self.pomodoro_running = False
@@ -1487,6 +1889,8 @@ class MainWindow(QMainWindow):
         self.schedule_list = QListWidget()
         self.schedule_list.setMaximumHeight(80)
         self.schedule_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        # self.schedules と同じ並びの QListWidgetItem（行単位の差分更新用）
+        self._list_items = []
         # スケジュール一覧をレイアウトに追加
         layout.addWidget(QLabel("登録済みスケジュール（ダブルクリックで編集メニュー）:"))
         layout.addWidget(self.schedule_list)
@@ -1520,15 +1924,14 @@ class MainWindow(QMainWindow):
         # プロファイルコンボボックスを更新
         self.update_profile_combo()
         
-        # 初期スケジュール読み込み
-        self.schedules = Schedule.load_all_from_db(self.current_profile_id)  # プロファイルIDを指定
+        # 初期スケジュール表示（読み込みは起動時とプロファイル変更時のみ）
         self.update_schedule_list()
         
         # ボタン
         button_layout = QHBoxLayout()
-        add_button = QPushButton("スケジュール追加")
-        add_button.clicked.connect(self.add_schedule)
-        button_layout.addWidget(add_button)
+        self.add_button = QPushButton("スケジュール追加")
+        self.add_button.clicked.connect(self.add_schedule)
+        button_layout.addWidget(self.add_button)
         # 追加: 常に手前チェックボックス（追加ボタンの右側）
         self.topmost_checkbox = QCheckBox("常に手前")
         self.topmost_checkbox.setChecked(False)
@@ -1536,54 +1939,38 @@ class MainWindow(QMainWindow):
         button_layout.addWidget(self.topmost_checkbox)
         button_layout.addStretch()
         layout.addLayout(button_layout)
-        
-        # 既存のスケジュールをリストに表示
-        self.update_schedule_list()
 
     def load_last_profile_id(self):
         """最後に使用したプロファイルIDを読み込む"""
         try:
-            conn = sqlite3.connect(DB_NAME)
-            c = conn.cursor()
-            
-            c.execute('SELECT profile_id FROM last_profile WHERE id = 1')
-            result = c.fetchone()
-            
-            if result:
-                profile_id = result[0]
-                # プロファイルが実際に存在するか確認
-                c.execute('SELECT COUNT(*) FROM profiles WHERE id = ?', (profile_id,))
-                if c.fetchone()[0] > 0:
-                    return profile_id
-            
-            # プロファイルが存在しない場合はデフォルトに設定
-            c.execute('UPDATE last_profile SET profile_id = 1 WHERE id = 1')
-            conn.commit()
-            return 1
+            with get_db_connection() as conn:
+                c = conn.cursor()
+                
+                c.execute('SELECT profile_id FROM last_profile WHERE id = 1')
+                result = c.fetchone()
+                
+                if result:
+                    profile_id = result[0]
+                    # プロファイルが実際に存在するか確認
+                    c.execute('SELECT COUNT(*) FROM profiles WHERE id = ?', (profile_id,))
+                    if c.fetchone()[0] > 0:
+                        return profile_id
+                
+                # プロファイルが存在しない場合はデフォルトに設定
+                c.execute(LAST_PROFILE_UPDATE_SQL, (1,))
+                return 1
                 
         except sqlite3.Error as e:
             print(f"プロファイルID読み込みエラー: {e}")
             return 1
-        finally:
-            if conn:
-                conn.close()
 
     @debug_profile_operation("保存")
     def save_last_profile_id(self):
         try:
-            conn = sqlite3.connect(DB_NAME)
-            c = conn.cursor()
-            c.execute('''
-                UPDATE last_profile 
-                SET profile_id = ? 
-                WHERE id = 1
-            ''', (self.current_profile_id,))
-            conn.commit()
+            with get_db_connection() as conn:
+                conn.execute(LAST_PROFILE_UPDATE_SQL, (self.current_profile_id,))
         except sqlite3.Error as e:
             print(f"プロファイルID保存エラー: {e}")
-        finally:
-            if conn:
-                conn.close()
 
     def moveEvent(self, event):
         """ウィンドウが移動した時に位置を保存"""
@@ -1593,15 +1980,22 @@ class MainWindow(QMainWindow):
     def update_clock(self):
         """時計表示の更新"""
         current = QDateTime.currentDateTime()
-        self.date_time_label.setText(
-            current.toString("yyyy/MM/dd (ddd) HH:mm")
-        )
-        self.seconds_label.setText(
-            current.toString("ss")
-        )
+        # 非表示・最小化中は表示を更新せず、アラーム判定のため分の境界でだけ起きる
+        visible = self.isVisible() and not self.isMinimized()
+        if visible:
+            # 次の秒の境界で再度呼ばれるようにする
+            self.timer.start(1000 - current.toMSecsSinceEpoch() % 1000)
+            self.date_time_label.setText(
+                current.toString("yyyy/MM/dd (ddd) HH:mm")
+            )
+            self.seconds_label.setText(
+                current.toString("ss")
+            )
 
-        # TimeBarWidgetを更新
-        self.timebar.update()
+            # TimeBarWidgetの時刻依存部分だけを更新
+            self.timebar.tick()
+        else:
+            self.timer.start(60000 - current.toMSecsSinceEpoch() % 60000)
 
         # ポモドーロ経過表示
         if self.pomodoro_running and self.pomodoro_start_dt is not None:
@@ -1609,25 +2003,27 @@ class MainWindow(QMainWindow):
                 current_elapsed_ms = self.pomodoro_accumulated_ms + self.pomodoro_start_dt.msecsTo(current)
             else:
                 current_elapsed_ms = self.pomodoro_accumulated_ms
-            elapsed_min = current_elapsed_ms // 60000
-            self.pomodoro_elapsed_label.setText(f"経過: {int(elapsed_min)} 分")
-            # 進捗バー更新（秒単位）
-            self.pomodoro_progress.setValue(int(current_elapsed_ms // 1000))
+            if visible:
+                elapsed_min = current_elapsed_ms // 60000
+                self.pomodoro_elapsed_label.setText(f"経過: {int(elapsed_min)} 分")
+                # 進捗バー更新（秒単位）
+                self.pomodoro_progress.setValue(int(current_elapsed_ms // 1000))
             # 25分に到達したら手動チェック（休憩中でない場合のみ）
             if current_elapsed_ms >= 25 * 60 * 1000 and not self.in_break:
                 self.on_pomodoro_25min()
 
         # 休憩中の表示更新（残り時間カウントダウン）
-        if self.in_break and self.break_end_dt is not None:
-            remaining_secs = QDateTime.currentDateTime().secsTo(self.break_end_dt)
-            if remaining_secs < 0:
-                remaining_secs = 0
-            mm = remaining_secs // 60
-            ss = remaining_secs % 60
-            self.break_label.setText(f"休憩中 ⏳ 残り {mm:02d}:{ss:02d}")
-            self.break_label.setVisible(True)
-        else:
-            self.break_label.setVisible(False)
+        if visible:
+            if self.in_break and self.break_end_dt is not None:
+                remaining_secs = QDateTime.currentDateTime().secsTo(self.break_end_dt)
+                if remaining_secs < 0:
+                    remaining_secs = 0
+                mm = remaining_secs // 60
+                ss = remaining_secs % 60
+                self.break_label.setText(f"休憩中 ⏳ 残り {mm:02d}:{ss:02d}")
+                self.break_label.setVisible(True)
+            else:
+                self.break_label.setVisible(False)
 
         # アラーム（予定/フリー）判定
         date_str = current.toString("yyyy-MM-dd")
@@ -1713,54 +2109,126 @@ class MainWindow(QMainWindow):
     def update_start_time(self):
         """基準時刻の更新"""
         self.start_time = self.start_time_edit.time().toString("HH:mm")
-        # 現在のプロファイルIDでスケジュールを読み込むように修正
-        self.schedules = Schedule.load_all_from_db(self.current_profile_id)
-        # タイムバーのスケジュールを更新
-        self.timebar.schedules = self.schedules
-        # 基準時刻を設定して再描画
+        # 基準時刻を設定して再描画（スケジュール自体は変わらないので再読み込みしない）
         self.timebar.set_start_time(self.start_time)
-        # スケジュール一覧も更新
-        self.update_schedule_list()
 
     def update_profile_combo(self):
         """プロファイル選択コンボボックスを更新"""
-        self.profile_combo.clear()
-        self.profiles = Profile.load_profiles_from_db()
-        for profile in self.profiles:
-            self.profile_combo.addItem(profile.name, profile.id)
-        # 現在のプロファイルを選択
-        index = self.profile_combo.findData(self.current_profile_id)
-        if index >= 0:
-            self.profile_combo.setCurrentIndex(index)
-            # プロファイル変更を保存
-            self.save_last_profile_id()
+        # プログラムからの変更で change_profile が連鎖しないようシグナルを止める
+        self.profile_combo.blockSignals(True)
+        try:
+            self.profile_combo.clear()
+            self.profiles = Profile.load_profiles_from_db()
+            for profile in self.profiles:
+                self.profile_combo.addItem(profile.name, profile.id)
+            # 現在のプロファイルを選択
+            index = self.profile_combo.findData(self.current_profile_id)
+            if index >= 0:
+                self.profile_combo.setCurrentIndex(index)
+        finally:
+            self.profile_combo.blockSignals(False)
+        # 選択中のプロファイルが無くなった場合は先頭のプロファイルに切り替える
+        if index < 0 and self.profile_combo.count() > 0:
+            self.profile_combo.setCurrentIndex(0)
+            self.change_profile(0)
     
     @debug_profile_operation("変更")
     def change_profile(self, index):
         """プロファイル変更時の処理"""
         if index >= 0:
             self.current_profile_id = self.profile_combo.itemData(index)
-            # プロファイル変更を即座に保存
-            self.save_last_profile_id()
-            # 選択されたプロファイルのスケジュールを読み込む
-            self.schedules = Schedule.load_all_from_db(self.current_profile_id)
-            self.update_schedule_list()
-            self.timebar.schedules = self.schedules
-            self.timebar.update()
+            # プロファイル変更の保存は少し待ってまとめて行う
+            self._save_debounce.start()
             # プロファイル変更時は当日の通知済みフラグをクリア
             self.alarm_fired_today.clear()
+            # 選択されたプロファイルのスケジュールを読み込む（一度読んだプロファイルはキャッシュから）
+            schedules = self._schedule_cache.get(self.current_profile_id)
+            if schedules is not None:
+                self._show_profile_schedules(schedules)
+                return
+            # 未読込ならワーカースレッドで読み込む。完了までは一覧・タイムバーを空にし、追加/編集もさせない
+            profile_id = self.current_profile_id
+            self._loading_profile_id = profile_id
+            self._set_schedule_editing_enabled(False)
+            self.schedules = []
+            self.update_schedule_list()
+            self.timebar.set_schedules(self.schedules)
+            task = LoadSchedulesTask(profile_id)
+            task.signals.loaded.connect(self._on_profile_schedules_loaded)
+            task.signals.failed.connect(self._on_profile_schedules_failed)
+            QThreadPool.globalInstance().start(task)
+
+    def _on_profile_schedules_loaded(self, result):
+        """LoadSchedulesTask の完了通知（GUIスレッド）"""
+        profile_id, schedules = result
+        # 読み込み中に別のプロファイルへ切り替わっていたら捨てる
+        if profile_id != self._loading_profile_id:
+            return
+        self._show_profile_schedules(schedules)
+
+    def _on_profile_schedules_failed(self, result):
+        """LoadSchedulesTask の失敗通知（GUIスレッド）。直前に表示していたプロファイルへ戻す"""
+        profile_id, message = result
+        if profile_id != self._loading_profile_id:
+            return
+        QMessageBox.warning(self, "エラー", f"スケジュールの読み込みに失敗しました: {message}")
+        previous_id = self._displayed_profile_id
+        schedules = self._schedule_cache.get(previous_id)
+        index = self.profile_combo.findData(previous_id)
+        if schedules is None or index < 0:
+            # 戻り先が無い場合は空のまま。追加/編集は無効のままにして不整合な保存を防ぐ
+            return
+        self.current_profile_id = previous_id
+        self._save_debounce.start()
+        self.profile_combo.blockSignals(True)
+        try:
+            self.profile_combo.setCurrentIndex(index)
+        finally:
+            self.profile_combo.blockSignals(False)
+        self._show_profile_schedules(schedules)
+
+    def _show_profile_schedules(self, schedules):
+        """現在のプロファイルのスケジュール一覧を画面へ反映"""
+        self._loading_profile_id = None
+        self._displayed_profile_id = self.current_profile_id
+        self._set_schedule_editing_enabled(True)
+        self.schedules = schedules
+        self.update_schedule_list()
+        self._schedules_changed()
+
+    def _set_schedule_editing_enabled(self, enabled):
+        """スケジュールの追加・編集・削除の操作可否を切り替える"""
+        self.add_button.setEnabled(enabled)
+        self.schedule_list.setEnabled(enabled)
+
+    def showEvent(self, event):
+        """再表示されたら止めていた表示を即座に最新にする"""
+        super().showEvent(event)
+        self.update_clock()
+
+    def changeEvent(self, event):
+        """最小化からの復帰時も即座に表示を更新"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and not self.isMinimized():
+            self.update_clock()
 
     def closeEvent(self, event):
         """ウィンドウを閉じる際の処理"""
-        # 最後に使用したプロファイルIDを保存
+        # 最後に使用したプロファイルIDを保存（保留中の遅延保存はここで確定させる）
+        self._save_debounce.stop()
         self.save_last_profile_id()
         event.accept()
 
     def manage_profiles(self):
         """プロファイル管理ダイアログを表示"""
         dialog = ProfileManageDialog(self)
-        if dialog.exec():
-            self.update_profile_combo()
+        # 追加・編集・削除はダイアログ内で即座にDBへ反映されるため、閉じ方によらず一覧を更新する
+        dialog.exec()
+        self.update_profile_combo()
+        # 削除されたプロファイルの分だけキャッシュから外す
+        profile_ids = {profile.id for profile in self.profiles}
+        for profile_id in [pid for pid in self._schedule_cache if pid not in profile_ids]:
+            del self._schedule_cache[profile_id]
 
     # === フリーアラーム ===
     def manage_free_alarms(self):
@@ -1783,18 +2251,20 @@ class MainWindow(QMainWindow):
                 data['color'],
                 profile_id=self.current_profile_id
             )
-            schedule.save_schedule_to_db()
-            self.schedules = Schedule.load_all_from_db(self.current_profile_id)
-            self.update_schedule_list()
-            self.timebar.schedules = self.schedules
-            self.timebar.update()
+            schedule.save_to_db()
+            # メモリ上の一覧を正とし、DBから再読み込みしない
+            self.schedules.append(schedule)
+            self._append_list_item(schedule)
+            self._schedules_changed()
             return schedule
 
     def delete_schedule(self, schedule):
         """スケジュールの削除"""
-        # scheduleがQListWidgetItemの場合はScheduleオブジェクトを取得
+        # scheduleがQListWidgetItemの場合は行番号からScheduleオブジェクトを取得
+        row = None
         if isinstance(schedule, QListWidgetItem):
-            schedule = self.schedules[self.schedule_list.row(schedule)]
+            row = self.schedule_list.row(schedule)
+            schedule = self.schedules[row]
         
         # 確認ダイアログを表示
         from PySide6.QtWidgets import QMessageBox
@@ -1807,19 +2277,42 @@ class MainWindow(QMainWindow):
         
         if confirm.exec() == QMessageBox.Yes:
             Schedule.delete_from_db(schedule.id)
-            self.schedules.remove(schedule)
-            self.update_schedule_list()
-            self.timebar.schedules = self.schedules
-            self.timebar.update()
+            if row is None:
+                row = self.schedules.index(schedule)
+            del self.schedules[row]
+            self._remove_list_item(row)
+            self._schedules_changed()
+
+    def _schedules_changed(self):
+        """self.schedules の変更をタイムバーへ反映（再計算と再描画要求はここで1回だけ）"""
+        # 読み込み中の仮の一覧はキャッシュに入れない
+        if self._loading_profile_id is None:
+            self._schedule_cache[self.current_profile_id] = self.schedules
+        self.timebar.set_schedules(self.schedules)
 
     def update_schedule_list(self):
-        """スケジュール一覧の更新"""
+        """スケジュール一覧の更新（全件作り直し。起動時とプロファイル変更時のみ）"""
         self.schedule_list.clear()
+        self._list_items = []
         for schedule in self.schedules:
-            item = QListWidgetItem(self.schedule_list)
-            widget = ScheduleListItem(schedule, self)
-            item.setSizeHint(widget.sizeHint())
-            self.schedule_list.setItemWidget(item, widget)
+            self._append_list_item(schedule)
+
+    def _append_list_item(self, schedule):
+        """一覧の末尾に1件追加"""
+        item = QListWidgetItem(self.schedule_list)
+        widget = ScheduleListItem(schedule, self)
+        item.setSizeHint(widget.sizeHint())
+        self.schedule_list.setItemWidget(item, widget)
+        self._list_items.append(item)
+
+    def _update_list_item(self, row, schedule):
+        """指定行の表示内容を更新"""
+        self.schedule_list.itemWidget(self._list_items[row]).refresh(schedule)
+
+    def _remove_list_item(self, row):
+        """指定行を一覧から取り除く"""
+        self.schedule_list.takeItem(row)
+        del self._list_items[row]
 
     @debug_profile_operation("スケジュール編集")
     def edit_schedule(self, schedule):
@@ -1841,17 +2334,20 @@ class MainWindow(QMainWindow):
             schedule.end_time = data['end_time']
             schedule.color = data['color']
             schedule.profile_id = data['profile_id']
-            schedule.save_schedule_to_db()
+            schedule.update_cache()
+            schedule.save_to_db()
             
-            # プロファイルが変更された場合は現在のリストから削除
+            # プロファイルが変更された場合は現在のリストから削除（それ以外はその行だけ更新）
+            row = self.schedules.index(schedule)
             if old_profile == self.current_profile_id and schedule.profile_id != self.current_profile_id:
-                self.schedules.remove(schedule)
+                del self.schedules[row]
+                self._remove_list_item(row)
+                # 移動先プロファイルのキャッシュは古くなるので破棄
+                self._schedule_cache.pop(schedule.profile_id, None)
+            else:
+                self._update_list_item(row, schedule)
             
-            # 現在表示中のプロファイルのスケジュールのみを再読み込み
-            self.schedules = Schedule.load_all_from_db(self.current_profile_id)
-            self.update_schedule_list()
-            self.timebar.schedules = self.schedules
-            self.timebar.update()
+            self._schedules_changed()
         elif result == 2:  # 削除
             self.delete_schedule(schedule)
 
@@ -2090,8 +2586,7 @@ class ProfileManageDialog(QDialog):
         name, ok = QInputDialog.getText(self, "プロファイル追加", "プロファイル名:")
         if ok and name:
             profile = Profile(name)
-            with get_db_connection() as conn:
-                profile.save_profile_to_db(conn)
+            profile.save_to_db()
             self.update_profile_list()
 
     def edit_profile(self):
@@ -2114,11 +2609,7 @@ class ProfileManageDialog(QDialog):
             
             if ok and new_name and new_name != current_name:
                 try:
-                    conn = sqlite3.connect(DB_NAME)
-                    c = conn.cursor()
-                    c.execute('UPDATE profiles SET name = ? WHERE id = ?', (new_name, profile_id))
-                    conn.commit()
-                    conn.close()
+                    Profile(new_name, profile_id).save_to_db()
                     self.update_profile_list()
                 except sqlite3.Error as e:
                     QMessageBox.warning(self, "エラー", f"プロファイル名の更新に失敗しました: {str(e)}")
@@ -2149,10 +2640,12 @@ try:
     init_db()
     
     app = QApplication(sys.argv)
+    # 終了時に共有DB接続を1回だけ閉じる
+    app.aboutToQuit.connect(close_db_connection)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
 except Exception as e:
-    trace = get_exception_trace()
+    trace = get_except_processing()
     print("エラーが発生しました：", trace)
     sys.exit(1)